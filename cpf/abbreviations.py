@@ -7,11 +7,38 @@ Supports custom overrides via JSON files.
 from __future__ import annotations
 
 import json
+import re
+import sys
+from collections.abc import Iterable, Mapping
+from functools import cache, lru_cache
 from pathlib import Path
+from types import MappingProxyType
+
+
+def _freeze(mapping: dict[str, str]) -> Mapping[str, str]:
+    """Intern keys/values and wrap the map in a read-only view."""
+    return MappingProxyType({sys.intern(k): sys.intern(v) for k, v in mapping.items()})
+
+
+def _invert_first(mapping: Mapping[str, str]) -> dict[str, str]:
+    """Invert value -> key, keeping the first key seen for each value."""
+    inverted: dict[str, str] = {}
+    for full, abbr in mapping.items():
+        inverted.setdefault(abbr, full)
+    return inverted
+
+
+def _lowercase_keys(mapping: Mapping[str, str]) -> dict[str, str]:
+    """Re-key a map by lowercased key, keeping the first entry on collisions."""
+    lowered: dict[str, str] = {}
+    for full, abbr in mapping.items():
+        lowered.setdefault(full.lower(), abbr)
+    return lowered
+
 
 # Encode map: full word -> abbreviation
 # Only whole-word replacements to avoid false positives.
-ENCODE_MAP: dict[str, str] = {
+ENCODE_MAP: Mapping[str, str] = _freeze({
     "module": "mod",
     "modules": "mods",
     "plugin": "plg",
@@ -102,15 +129,58 @@ ENCODE_MAP: dict[str, str] = {
     "otherwise": "else",
     "approximately": "~",
     "important": "*",
-}
+})
 
 # Decode map: abbreviation -> full word (built from ENCODE_MAP, keeping first match)
-DECODE_MAP: dict[str, str] = {}
-_seen_abbrs: set[str] = set()
-for _full, _abbr in ENCODE_MAP.items():
-    if _abbr not in _seen_abbrs:
-        DECODE_MAP[_abbr] = _full
-        _seen_abbrs.add(_abbr)
+DECODE_MAP: Mapping[str, str] = _freeze(_invert_first(ENCODE_MAP))
+
+# Case-insensitive ENCODE_MAP lookup table for abbreviate()
+_ENCODE_MAP_CI: dict[str, str] = _lowercase_keys(ENCODE_MAP)
+
+
+def trie_alternation(words: Iterable[str]) -> str:
+    """Build a regex alternation for `words`, factored as a character trie.
+
+    'mod', 'mods' and 'mw' become 'm(?:od(?:s)?|w)', so the regex engine
+    follows a single branch per input character instead of trying every
+    word in turn (an Aho-Corasick-style scan using only the stdlib `re`).
+    Optional suffixes are greedy, so the longest word at a position is
+    tried first, exactly as with a longest-first flat alternation.
+    """
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _emit_trie(trie)
+
+
+def _emit_trie(node: dict[str, dict]) -> str:
+    """Render one trie node (see trie_alternation)."""
+    is_end = "" in node
+    branches = [re.escape(ch) + _emit_trie(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")" + ("?" if is_end else "")
+
+
+@lru_cache(maxsize=32)
+def expansion_pattern(abbrs: frozenset[str]) -> re.Pattern[str]:
+    """Compile one regex matching any of `abbrs` as a whole token.
+
+    The abbreviation is captured in group 1; longer abbreviations win
+    over their own prefixes.
+    """
+    return re.compile(r"(?<![a-zA-Z])(" + trie_alternation(abbrs) + r")(?![a-zA-Z])")
+
+
+@cache
+def decode_pattern() -> re.Pattern[str]:
+    """The compiled `expansion_pattern` for DECODE_MAP, built on first use."""
+    return expansion_pattern(frozenset(DECODE_MAP))
 
 
 def abbreviate(word: str, custom: dict[str, str] | None = None) -> str:
@@ -120,6 +190,8 @@ def abbreviate(word: str, custom: dict[str, str] | None = None) -> str:
     if word in lookup:
         return lookup[word]
     lower = word.lower()
+    if lookup is ENCODE_MAP:
+        return _ENCODE_MAP_CI.get(lower, word)
     for full, abbr in lookup.items():
         if lower == full.lower():
             return abbr
@@ -143,8 +215,8 @@ def load_custom_abbreviations(path: Path) -> tuple[dict[str, str], dict[str, str
 
 
 def merge_abbreviations(
-    base_encode: dict[str, str],
-    base_decode: dict[str, str],
+    base_encode: Mapping[str, str],
+    base_decode: Mapping[str, str],
     custom_encode: dict[str, str],
     custom_decode: dict[str, str],
 ) -> tuple[dict[str, str], dict[str, str]]:
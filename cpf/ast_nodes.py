@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 
+# One "key::value" pair of an @C line. Pairs are ';'-separated and split
+# at their first '::'; anything without '::' is ignored.
+_CONSTANT_PAIR_RE = re.compile(r"(?:^|(?<=;))([^;]*?)::([^;]*)")
 
-@dataclass
+
+@dataclass(slots=True)
 class Metadata:
     """Document metadata from the M| header line."""
     doc_id: str
@@ -14,7 +19,7 @@ class Metadata:
     timestamp: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     """A single CPF block (e.g. @R:mod-first with its content lines)."""
     sigil: str          # Single letter: R, P, N, S, T, X, Z, C, B
@@ -23,7 +28,7 @@ class Block:
     is_heredoc: bool = False  # True for @B blocks with << >>
 
 
-@dataclass
+@dataclass(slots=True)
 class CPFDocument:
     """A complete CPF v1 document."""
     version: str
@@ -31,7 +36,7 @@ class CPFDocument:
     blocks: list[Block] = field(default_factory=list)
 
     def get_block(self, block_id: str) -> Block | None:
-        """Find a block by its ID."""
+        """Find a block by its ID (the first one, if IDs repeat)."""
         for b in self.blocks:
             if b.block_id == block_id:
                 return b
@@ -45,10 +50,6 @@ class CPFDocument:
         """Extract all @C block definitions as a flat dict."""
         constants: dict[str, str] = {}
         for block in self.get_blocks_by_sigil("C"):
-            for line in block.lines:
-                for pair in line.split(";"):
-                    pair = pair.strip()
-                    if "::" in pair:
-                        key, _, val = pair.partition("::")
-                        constants[key.strip()] = val.strip()
+            pairs = _CONSTANT_PAIR_RE.findall(";".join(block.lines))
+            constants.update({key.strip(): val.strip() for key, val in pairs})
         return constants
@@ -9,12 +9,15 @@ from pathlib import Path
 from . import __version__
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def _cmd_encode(args: argparse.Namespace) -> int:
-    from .abbreviations import (
-        ENCODE_MAP,
-        load_custom_abbreviations,
-        merge_abbreviations,
-    )
+    from .abbreviations import load_custom_abbreviations
     from .encoder import encode
 
     text = args.input.read_text(encoding="utf-8")
@@ -29,6 +32,7 @@ def _cmd_encode(args: argparse.Namespace) -> int:
         title=args.title,
         source=str(args.input),
         custom_abbrevs=custom,
+        jobs=args.jobs,
     )
 
     if args.output:
@@ -41,7 +45,7 @@ def _cmd_encode(args: argparse.Namespace) -> int:
 
 
 def _cmd_decode(args: argparse.Namespace) -> int:
-    from .abbreviations import DECODE_MAP, load_custom_abbreviations
+    from .abbreviations import load_custom_abbreviations
     from .decoder import decode
 
     text = args.input.read_text(encoding="utf-8")
@@ -128,6 +132,7 @@ def main(argv: list[str] | None = None) -> int:
     enc.add_argument("--abbrev", type=Path, help="Custom abbreviation JSON file")
     enc.add_argument("--id", type=str, help="Document ID (auto-generated if not given)")
     enc.add_argument("--title", type=str, help="Document title (extracted from input if not given)")
+    enc.add_argument("-j", "--jobs", type=_positive_int, default=1, help="Worker processes for large documents")
 
     # decode
     dec = sub.add_parser("decode", help="Convert CPF back to English markdown")
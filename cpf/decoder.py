@@ -7,8 +7,11 @@ English markdown that preserves the semantic meaning.
 from __future__ import annotations
 
 import re
+from collections import ChainMap
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 
-from .abbreviations import DECODE_MAP
+from .abbreviations import DECODE_MAP, decode_pattern, expansion_pattern
 from .ast_nodes import Block, CPFDocument
 from .parser import parse
 from .spec import SIGILS
@@ -27,6 +30,23 @@ _SIGIL_TITLES: dict[str, str] = {
     "B": "",          # Blobs get block_id as title
 }
 
+# Line-level patterns used by expand_line
+_PRIORITY_RE = re.compile(r"^#(\d+)\s+(.+)$")
+_PREFER_RE = re.compile(r"^prefer\((.+?)\)>(.+)$")
+
+# Tokens for _replace_connectives: parens track depth, + and | are rewritten
+_CONNECTIVE_TOKEN_RE = re.compile(r"[()+|]")
+_CONNECTIVES: dict[str, str] = {"+": " and ", "|": " or "}
+
+
+@dataclass(frozen=True, slots=True)
+class _ExpansionCtx:
+    """An abbreviation map together with its compiled matcher."""
+    abbrevs: Mapping[str, str]
+    pattern: re.Pattern[str] | None
+    # Match -> replacement callback, bound once per context
+    repl: Callable[[re.Match[str]], str] | None = None
+
 
 def decode(text: str, custom_decode: dict[str, str] | None = None) -> str:
     """Decode a CPF v1 string into English markdown.
@@ -44,12 +64,16 @@ def decode(text: str, custom_decode: dict[str, str] | None = None) -> str:
 
 def decode_ast(doc: CPFDocument, custom_decode: dict[str, str] | None = None) -> str:
     """Decode a CPFDocument AST into English markdown."""
-    abbrevs = {**DECODE_MAP, **(custom_decode or {})}
-
     # Collect constants from @C blocks for inline expansion
     constants = doc.get_constants()
-    if constants:
-        abbrevs.update(constants)
+
+    # Layer constants over custom mappings over the built-ins without
+    # copying DECODE_MAP; a plain document uses the built-in map as is.
+    overrides = [m for m in (constants, custom_decode) if m]
+    abbrevs: Mapping[str, str] = (
+        ChainMap(*overrides, DECODE_MAP) if overrides else DECODE_MAP
+    )
+    ctx = _build_ctx(abbrevs)
 
     lines: list[str] = []
     lines.append(f"# {doc.metadata.title}")
@@ -74,7 +98,7 @@ def decode_ast(doc: CPFDocument, custom_decode: dict[str, str] | None = None) ->
 
         # Decode each line based on block type
         for content_line in block.lines:
-            expanded = expand_line(content_line, abbrevs, block.sigil)
+            expanded = _expand_line(content_line, ctx)
             if expanded:
                 lines.append(expanded)
 
@@ -83,151 +107,213 @@ def decode_ast(doc: CPFDocument, custom_decode: dict[str, str] | None = None) ->
     return "\n".join(lines).rstrip() + "\n"
 
 
-def expand_line(line: str, abbrevs: dict[str, str], sigil: str = "R") -> str:
+def expand_line(line: str, abbrevs: Mapping[str, str], sigil: str = "R") -> str:
     """Expand a single CPF line into English.
 
     Handles operators, abbreviations, and formatting based on block type.
     """
-    if not line.strip():
+    return _expand_line(line, _build_ctx(abbrevs))
+
+
+def _expand_line(line: str, ctx: _ExpansionCtx) -> str:
+    """Expand a single CPF line using a prebuilt expansion context."""
+    # str.isspace() rejects blank lines without building a stripped copy
+    if not line or line.isspace():
         return ""
 
     text = line.strip()
 
-    # Conditional: "?condition->action" or "?!condition->action"
+    # Dispatch on the leading character; a handler returns None when the
+    # line only looks like its form (e.g. "#x" without a priority number).
+    handler = _LINE_HANDLERS.get(text[0])
+    if handler is not None:
+        expanded = handler(text, ctx)
+        if expanded is not None:
+            return expanded
+    return _handle_plain(text, ctx)
+
+
+def _handle_conditional(text: str, ctx: _ExpansionCtx) -> str:
+    """Conditional: "?condition->action" or "?!condition->action"."""
     if text.startswith("?!"):
-        text = _expand_conditional(text[2:], negated=True, abbrevs=abbrevs)
+        text = _expand_conditional(text[2:], negated=True, ctx=ctx)
         return f"- Unless {text}"
-    if text.startswith("?"):
-        text = _expand_conditional(text[1:], negated=False, abbrevs=abbrevs)
-        return f"- If {text}"
-
-    # Negation: "!!something"
-    if text.startswith("!!"):
-        content = _expand_fragment(text[2:], abbrevs)
-        return f"- Do NOT {content}."
-
-    # Emphasis/must: "*something"
-    if text.startswith("*"):
-        content = _expand_fragment(text[1:], abbrevs)
-        return f"- **{_capitalize(content)}.**"
-
-    # Priority: "#1 something"
-    m = re.match(r"^#(\d+)\s+(.+)$", text)
-    if m:
-        num = m.group(1)
-        content = _expand_fragment(m.group(2), abbrevs)
-        return f"{num}. {_capitalize(content)}"
-
-    # Prefer: "prefer(X)>Y"
-    m = re.match(r"^prefer\((.+?)\)>(.+)$", text)
-    if m:
-        preferred = _expand_fragment(m.group(1), abbrevs)
-        over = _expand_fragment(m.group(2), abbrevs)
-        return f"- Prefer {preferred} over {over}."
-
-    # Definition: "key::value"
-    if "::" in text and not text.startswith("@>"):
+    text = _expand_conditional(text[1:], negated=False, ctx=ctx)
+    return f"- If {text}"
+
+
+def _handle_negation(text: str, ctx: _ExpansionCtx) -> str | None:
+    """Negation: "!!something"."""
+    if not text.startswith("!!"):
+        return None
+    content = _expand_fragment(text[2:], ctx)
+    return f"- Do NOT {content}."
+
+
+def _handle_emphasis(text: str, ctx: _ExpansionCtx) -> str:
+    """Emphasis/must: "*something"."""
+    content = _expand_fragment(text[1:], ctx)
+    return f"- **{_capitalize(content)}.**"
+
+
+def _handle_priority(text: str, ctx: _ExpansionCtx) -> str | None:
+    """Priority: "#1 something"."""
+    m = _PRIORITY_RE.match(text)
+    if not m:
+        return None
+    num = m.group(1)
+    content = _expand_fragment(m.group(2), ctx)
+    return f"{num}. {_capitalize(content)}"
+
+
+def _handle_prefer(text: str, ctx: _ExpansionCtx) -> str | None:
+    """Prefer: "prefer(X)>Y"."""
+    m = _PREFER_RE.match(text)
+    if not m:
+        return None
+    preferred = _expand_fragment(m.group(1), ctx)
+    over = _expand_fragment(m.group(2), ctx)
+    return f"- Prefer {preferred} over {over}."
+
+
+def _handle_delegate(text: str, ctx: _ExpansionCtx) -> str | None:
+    """Delegate: "@>reference"."""
+    if not text.startswith("@>"):
+        return None
+    ref = _expand_fragment(text[2:], ctx)
+    return f"- See {ref}."
+
+
+def _handle_plain(text: str, ctx: _ExpansionCtx) -> str:
+    """Definition ("key::value") or a plain bullet."""
+    if "::" in text:
         parts = text.split("::", 1)
-        key = _expand_fragment(parts[0], abbrevs)
-        val = _expand_fragment(parts[1], abbrevs)
+        key = _expand_fragment(parts[0], ctx)
+        val = _expand_fragment(parts[1], ctx)
         return f"- **{_capitalize(key)}:** {val}."
 
-    # Delegate: "@>reference"
-    if text.startswith("@>"):
-        ref = _expand_fragment(text[2:], abbrevs)
-        return f"- See {ref}."
-
-    # Default: expand as a bullet
-    content = _expand_fragment(text, abbrevs)
+    content = _expand_fragment(text, ctx)
     return f"- {_capitalize(content)}."
 
 
-def _expand_conditional(text: str, negated: bool, abbrevs: dict[str, str]) -> str:
+# Line handlers keyed by the first character of the stripped line
+_LINE_HANDLERS: dict[str, Callable[[str, _ExpansionCtx], str | None]] = {
+    "?": _handle_conditional,
+    "!": _handle_negation,
+    "*": _handle_emphasis,
+    "#": _handle_priority,
+    "p": _handle_prefer,
+    "@": _handle_delegate,
+}
+
+
+def _expand_conditional(text: str, negated: bool, ctx: _ExpansionCtx) -> str:
     """Expand a conditional expression."""
     # Split on -> for condition -> action
     if "->" in text:
         parts = text.split("->", 1)
-        condition = _expand_fragment(parts[0], abbrevs)
+        condition = _expand_fragment(parts[0], ctx)
         action_part = parts[1]
 
         # Handle else: "action;else_action"
         if ";" in action_part:
             action_parts = action_part.split(";", 1)
-            action = _expand_fragment(action_parts[0], abbrevs)
+            action = _expand_fragment(action_parts[0], ctx)
             else_part = action_parts[1].strip()
 
             # Check if else part is a negation
             if else_part.startswith("!!"):
-                else_text = _expand_fragment(else_part[2:], abbrevs)
+                else_text = _expand_fragment(else_part[2:], ctx)
                 return f"{condition}: {action}. Do NOT {else_text}."
             else:
-                else_text = _expand_fragment(else_part, abbrevs)
+                else_text = _expand_fragment(else_part, ctx)
                 return f"{condition}: {action}. Otherwise, {else_text}."
         else:
-            action = _expand_fragment(action_part, abbrevs)
+            action = _expand_fragment(action_part, ctx)
             prefix = "not " if negated else ""
             return f"{prefix}{condition}: {action}."
     else:
-        content = _expand_fragment(text, abbrevs)
+        content = _expand_fragment(text, ctx)
         prefix = "not " if negated else ""
         return f"{prefix}{content}."
 
 
-def _expand_fragment(text: str, abbrevs: dict[str, str]) -> str:
+def _expand_fragment(text: str, ctx: _ExpansionCtx) -> str:
     """Expand abbreviations and operators in a text fragment."""
     # Replace operators with English words
     text = text.replace("=>", " results in ")
     text = text.replace("->", " then ")
-    text = re.sub(r"@>", "see ", text)
-
-    # Replace + with " and " (but not inside parentheses for grouped items)
-    text = _replace_outside_parens(text, "+", " and ")
+    text = text.replace("@>", "see ")
 
-    # Replace | with " or "
-    text = _replace_outside_parens(text, "|", " or ")
+    # Replace + with " and " and | with " or " (but not inside parentheses
+    # for grouped items)
+    text = _replace_connectives(text)
 
     # Expand abbreviations (reverse: short -> full)
-    text = _apply_expansions(text, abbrevs)
+    text = _apply_expansions(text, ctx)
 
-    # Clean up spacing
-    text = re.sub(r"\s+", " ", text).strip()
+    # Clean up spacing (str.split() and regex \s agree on what whitespace is)
+    text = " ".join(text.split())
 
     return text
 
 
-def _replace_outside_parens(text: str, old: str, new: str) -> str:
-    """Replace `old` with `new` but only outside parentheses."""
+def _replace_connectives(text: str) -> str:
+    """Replace + and | with " and " / " or ", but only outside parentheses.
+
+    Both connectives are handled in one left-to-right pass over the text.
+    """
+    if "(" not in text:
+        # Depth never leaves zero, so every occurrence is outside parens.
+        # Two str.replace calls beat str.translate here: translate looks up
+        # every character in its table, replace only scans for the operator.
+        return text.replace("+", " and ").replace("|", " or ")
+
     depth = 0
-    result = []
-    i = 0
-    while i < len(text):
-        if text[i] == "(":
+    result: list[str] = []
+    pos = 0
+    for m in _CONNECTIVE_TOKEN_RE.finditer(text):
+        token = m.group()
+        if token == "(":
             depth += 1
-            result.append(text[i])
-        elif text[i] == ")":
+        elif token == ")":
             depth = max(0, depth - 1)
-            result.append(text[i])
-        elif depth == 0 and text[i:i + len(old)] == old:
-            result.append(new)
-            i += len(old)
-            continue
-        else:
-            result.append(text[i])
-        i += 1
+        elif depth == 0:
+            result.append(text[pos:m.start()])
+            result.append(_CONNECTIVES[token])
+            pos = m.end()
+    result.append(text[pos:])
     return "".join(result)
 
 
-def _apply_expansions(text: str, abbrevs: dict[str, str]) -> str:
-    """Replace abbreviations with full words."""
-    # Sort by length descending to avoid partial matches
-    sorted_entries = sorted(abbrevs.items(), key=lambda x: len(x[0]), reverse=True)
-
-    for abbr, full in sorted_entries:
-        # Only match as whole tokens (word boundaries or adjacent to operators)
-        pattern = r"(?<![a-zA-Z])" + re.escape(abbr) + r"(?![a-zA-Z])"
-        text = re.sub(pattern, full, text)
-
-    return text
+def _build_ctx(abbrevs: Mapping[str, str]) -> _ExpansionCtx:
+    """Pair an abbreviation map with its (cached) compiled matcher."""
+    if not abbrevs:
+        return _ExpansionCtx(abbrevs, None)
+    if abbrevs is DECODE_MAP:
+        pattern = decode_pattern()
+    else:
+        pattern = expansion_pattern(frozenset(abbrevs))
+    if isinstance(abbrevs, ChainMap):
+        # A chained lookup walks every layer; resolve each key only once
+        resolved: dict[str, str] = {}
+
+        def repl(m: re.Match[str]) -> str:
+            key = m[1]
+            value = resolved.get(key)
+            if value is None:
+                value = resolved[key] = abbrevs[key]
+            return value
+
+        return _ExpansionCtx(abbrevs, pattern, repl)
+    return _ExpansionCtx(abbrevs, pattern, lambda m: abbrevs[m[1]])
+
+
+def _apply_expansions(text: str, ctx: _ExpansionCtx) -> str:
+    """Replace abbreviations with full words in a single regex pass."""
+    if ctx.pattern is None:
+        return text
+    return ctx.pattern.sub(ctx.repl, text)
 
 
 def _capitalize(text: str) -> str:
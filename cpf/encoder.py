@@ -7,15 +7,32 @@ instruction bullets and produces a CPF v1 document.
 from __future__ import annotations
 
 import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 
 from .abbreviations import ENCODE_MAP
 from .ast_nodes import Block, CPFDocument, Metadata
 from .formatter import format_document
 from .patterns import EXACT_MATCH_RE, PATH_REF_RE, classify_section
-from .tokenizer import compress_line
-from .utils import extract_section_header, slugify
+from .tokenizer import compress_lines
+from .utils import normalize_newlines, slugify
+
+# Minimum number of sections before encode(jobs=N) uses worker processes;
+# below this, process start-up costs more than it saves.
+_PARALLEL_MIN_SECTIONS = 8
+
+# A markdown header line (same rules as utils.extract_section_header),
+# matched across the whole buffer; group 1 is the stripped header text.
+_SECTION_HEADER_RE = re.compile(r"(?m)^[^\S\n]*#{1,6}[^\S\n]+(.*\S)[^\S\n]*$")
+
+# (epoch second, formatted UTC timestamp) of the last encode; batch runs
+# encode many documents within the same second.
+_last_timestamp: tuple[int, str] = (-1, "")
 
 
 def encode(
@@ -25,6 +42,7 @@ def encode(
     title: str | None = None,
     source: str = "",
     custom_abbrevs: dict[str, str] | None = None,
+    jobs: int = 1,
 ) -> str:
     """Encode an English markdown instruction document into CPF v1 format.
 
@@ -34,81 +52,24 @@ def encode(
         title: Document title (extracted from # header if not given).
         source: Source file path or URL.
         custom_abbrevs: Additional abbreviation mappings to merge with defaults.
+        jobs: Worker processes used to encode sections of large documents.
 
     Returns:
         CPF v1 formatted string.
     """
-    abbrevs = {**ENCODE_MAP, **(custom_abbrevs or {})}
-    sections = _split_sections(text)
+    first_header, blocks = _encode_body(text, tuple((custom_abbrevs or {}).items()), jobs)
 
-    # Extract title from first H1 if present
+    # Title defaults to the first header
     if not title:
-        for header, _ in sections:
-            if header:
-                title = header
-                break
-        if not title:
-            title = "Untitled"
+        title = first_header or "Untitled"
 
     if not doc_id:
         doc_id = slugify(title)[:40]
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    timestamp = _utc_timestamp()
     metadata = Metadata(doc_id=doc_id, title=title, source=source, timestamp=timestamp)
 
-    # Extract path aliases: find repeated long paths and create $VAR references
-    path_aliases = _extract_path_aliases(text)
-
-    blocks: list[Block] = []
-
-    # Emit path constants block if we have aliases
-    if path_aliases:
-        const_lines = [f"${alias}::{path}" for path, alias in path_aliases.items()]
-        blocks.append(Block(sigil="C", block_id="paths", lines=const_lines))
-
-    for header, lines in sections:
-        if not header or not lines:
-            continue
-
-        # Filter to non-empty content lines
-        content_lines = [l for l in lines if l.strip()]
-        if not content_lines:
-            continue
-
-        # Classify section type
-        sigil = classify_section(header, content_lines)
-        block_id = slugify(header)[:50]
-
-        # Check for exact match requirements -> produce @X block
-        exact_matches = _extract_exact_matches(content_lines)
-        if exact_matches and sigil == "R":
-            # If section has both rules and exact matches, split them
-            pass  # Keep as rule block; exact matches embedded in content
-
-        # Check for path-heavy content -> override to @Z
-        path_count = sum(1 for l in content_lines if PATH_REF_RE.search(l))
-        if path_count > 0 and path_count / len(content_lines) > 0.5:
-            sigil = "Z"
-
-        # Compress each line
-        compressed_lines = []
-        for line in content_lines:
-            compressed = compress_line(line, abbrevs)
-            # Apply path aliases
-            if compressed and path_aliases:
-                for path, alias in path_aliases.items():
-                    compressed = compressed.replace(path, f"${alias}")
-            if compressed:
-                compressed_lines.append(compressed)
-
-        if compressed_lines:
-            blocks.append(Block(
-                sigil=sigil,
-                block_id=block_id,
-                lines=compressed_lines,
-            ))
-
-    doc = CPFDocument(version="v1", metadata=metadata, blocks=blocks)
+    doc = CPFDocument(version="v1", metadata=metadata, blocks=list(blocks))
     return format_document(doc)
 
 
@@ -130,28 +91,126 @@ def encode_file(
     )
 
 
+@lru_cache(maxsize=32)
+def _encode_body(
+    text: str,
+    custom_abbrevs: tuple[tuple[str, str], ...],
+    jobs: int,
+) -> tuple[str | None, tuple[Block, ...]]:
+    """The first header of `text` and its encoded blocks.
+
+    Cached: re-encoding the same source only changes the metadata line.
+    The blocks are shared between calls and must not be mutated.
+    """
+    # None selects the built-in map, so compress_lines can use its line cache
+    abbrevs = {**ENCODE_MAP, **dict(custom_abbrevs)} if custom_abbrevs else None
+    sections = _split_sections(text)
+    first_header = next((header for header, _ in sections if header), None)
+
+    # Extract path aliases: find repeated long paths and create $VAR references
+    path_aliases = _extract_path_aliases(text)
+
+    blocks: list[Block] = []
+
+    # Emit path constants block if we have aliases
+    if path_aliases:
+        const_lines = [f"${alias}::{path}" for path, alias in path_aliases.items()]
+        blocks.append(Block(sigil="C", block_id="paths", lines=const_lines))
+
+    # Sections are independent, so big documents can be spread over processes
+    if jobs > 1 and len(sections) >= _PARALLEL_MIN_SECTIONS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            section_blocks = list(pool.map(
+                _encode_section, sections, repeat(abbrevs), repeat(path_aliases),
+                chunksize=max(1, len(sections) // (jobs * 4)),
+            ))
+    else:
+        section_blocks = [_encode_section(s, abbrevs, path_aliases) for s in sections]
+    blocks.extend(b for b in section_blocks if b is not None)
+
+    return first_header, tuple(blocks)
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as an ISO-8601 string, formatted once per second."""
+    global _last_timestamp
+    second = int(time.time())
+    if _last_timestamp[0] != second:
+        formatted = datetime.fromtimestamp(second, timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        _last_timestamp = (second, formatted)
+    return _last_timestamp[1]
+
+
+def _encode_section(
+    section: tuple[str | None, list[str]],
+    abbrevs: dict[str, str] | None,
+    path_aliases: dict[str, str],
+) -> Block | None:
+    """Encode one (header, lines) section into a block, or None if it is empty."""
+    header, lines = section
+    if not header or not lines:
+        return None
+
+    # Filter to non-empty content lines
+    content_lines = [l for l in lines if l and not l.isspace()]
+    if not content_lines:
+        return None
+
+    # Classify section type
+    sigil = classify_section(header, content_lines)
+    block_id = slugify(header)[:50]
+
+    # Check for exact match requirements -> produce @X block
+    exact_matches = _extract_exact_matches(content_lines)
+    if exact_matches and sigil == "R":
+        # If section has both rules and exact matches, split them
+        pass  # Keep as rule block; exact matches embedded in content
+
+    # Check for path-heavy content -> override to @Z
+    path_count = sum(1 for l in content_lines if PATH_REF_RE.search(l))
+    if path_count > 0 and path_count / len(content_lines) > 0.5:
+        sigil = "Z"
+
+    # Compress all lines of the section in one batch
+    compressed_lines = []
+    for compressed in compress_lines(content_lines, abbrevs):
+        # Apply path aliases
+        if compressed and path_aliases:
+            for path, alias in path_aliases.items():
+                compressed = compressed.replace(path, f"${alias}")
+        if compressed:
+            compressed_lines.append(compressed)
+
+    if not compressed_lines:
+        return None
+    return Block(sigil=sigil, block_id=block_id, lines=compressed_lines)
+
+
 def _split_sections(text: str) -> list[tuple[str | None, list[str]]]:
     """Split markdown text into (header, [content_lines]) tuples.
 
     Groups content under ## headers. Content before the first header
     gets header=None.
     """
+    # Normalise line endings so "^"/"$" see the same lines as splitlines()
+    text = normalize_newlines(text)
+
+    # Locate every header in one scan and slice the content between them
     sections: list[tuple[str | None, list[str]]] = []
     current_header: str | None = None
-    current_lines: list[str] = []
-
-    for line in text.splitlines():
-        header = extract_section_header(line)
-        if header is not None:
-            # Save previous section
-            if current_header is not None or current_lines:
-                sections.append((current_header, current_lines))
-            current_header = header
-            current_lines = []
-        else:
-            current_lines.append(line)
+    pos = 0
+    for m in _SECTION_HEADER_RE.finditer(text):
+        current_lines = text[pos:m.start()].splitlines()
+        # Save previous section
+        if current_header is not None or current_lines:
+            sections.append((current_header, current_lines))
+        current_header = m.group(1)
+        pos = m.end() + 1
 
     # Save last section
+    current_lines = text[pos:].splitlines()
     if current_header is not None or current_lines:
         sections.append((current_header, current_lines))
 
@@ -173,25 +232,23 @@ def _extract_path_aliases(text: str) -> dict[str, str]:
 
     Returns {path: alias} mapping.
     """
-    # Find all paths (at least 30 chars to be worth aliasing)
-    paths = PATH_REF_RE.findall(text)
-    path_counts: dict[str, int] = {}
-    for p in paths:
-        if len(p) >= 30:
-            path_counts[p] = path_counts.get(p, 0) + 1
+    # Count paths (at least 30 chars to be worth aliasing)
+    path_counts = Counter(p for p in PATH_REF_RE.findall(text) if len(p) >= 30)
 
     # Only alias paths that appear 2+ times
     aliases: dict[str, str] = {}
+    used_aliases: set[str] = set()
     counter = 0
-    for path, count in sorted(path_counts.items(), key=lambda x: -x[1]):
+    for path, count in path_counts.most_common():
         if count < 2:
-            continue
+            break
         # Generate short alias from last path component
         parts = path.rstrip("/").split("/")
         alias = parts[-1].lower().replace(".", "-").replace(" ", "-")[:12]
-        if alias in aliases.values():
+        if alias in used_aliases:
             alias = f"{alias}{counter}"
         aliases[path] = alias
+        used_aliases.add(alias)
         counter += 1
 
     return aliases
@@ -2,36 +2,55 @@
 
 from __future__ import annotations
 
+import io
+
 from .ast_nodes import CPFDocument
 from .spec import FORMAT_HEADER, HEREDOC_CLOSE, HEREDOC_OPEN, METADATA_PREFIX, SECTION_SEPARATOR
 
 
 def format_document(doc: CPFDocument) -> str:
     """Render a CPFDocument AST into a CPF v1 string."""
-    lines: list[str] = []
+    # Write fragments straight into one buffer instead of building a
+    # throwaway f-string per line and joining them at the end.
+    buf = io.StringIO()
+    write = buf.write
 
     # Header
-    lines.append(FORMAT_HEADER)
+    write(FORMAT_HEADER)
+    write("\n")
 
     # Metadata
     m = doc.metadata
-    lines.append(f"{METADATA_PREFIX}{m.doc_id}|{m.title}|{m.source}|{m.timestamp}")
+    write(METADATA_PREFIX)
+    write(m.doc_id)
+    write("|")
+    write(m.title)
+    write("|")
+    write(m.source)
+    write("|")
+    write(m.timestamp)
+    write("\n")
 
     # Separator
-    lines.append(SECTION_SEPARATOR)
+    write(SECTION_SEPARATOR)
+    write("\n")
 
     # Blocks
     for block in doc.blocks:
-        lines.append("")  # blank line between blocks
-        lines.append(f"@{block.sigil}:{block.block_id}")
+        write("\n@")  # blank line between blocks
+        write(block.sigil)
+        write(":")
+        write(block.block_id)
+        write("\n")
 
         if block.is_heredoc:
-            lines.append(HEREDOC_OPEN)
-            for content_line in block.lines:
-                lines.append(content_line)
-            lines.append(HEREDOC_CLOSE)
-        else:
-            for content_line in block.lines:
-                lines.append(content_line)
-
-    return "\n".join(lines) + "\n"
+            write(HEREDOC_OPEN)
+            write("\n")
+        for content_line in block.lines:
+            write(content_line)
+            write("\n")
+        if block.is_heredoc:
+            write(HEREDOC_CLOSE)
+            write("\n")
+
+    return buf.getvalue()
@@ -6,14 +6,16 @@ import re
 
 from .ast_nodes import Block, CPFDocument, Metadata
 from .spec import (
-    BLOCK_RE_PATTERN,
+    BLOCK_LINE_RE_PATTERN,
     FORMAT_HEADER,
     HEREDOC_CLOSE,
+    HEREDOC_CLOSE_LINE_RE_PATTERN,
     HEREDOC_OPEN,
     METADATA_PREFIX,
     SECTION_SEPARATOR,
     SIGILS,
 )
+from .utils import normalize_newlines
 
 
 class ParseError(Exception):
@@ -21,10 +23,17 @@ class ParseError(Exception):
 
     def __init__(self, line_num: int, message: str):
         self.line_num = line_num
-        super().__init__(f"Line {line_num}: {message}")
+        self.message = message
+        super().__init__(line_num, message)
 
+    def __str__(self) -> str:
+        # Formatted only when shown; callers that just catch it skip this
+        return f"Line {self.line_num}: {self.message}"
 
-_BLOCK_RE = re.compile(BLOCK_RE_PATTERN)
+
+# Whole-buffer scanners: block headers and heredoc close lines
+_BLOCK_LINE_RE = re.compile(BLOCK_LINE_RE_PATTERN)
+_HEREDOC_CLOSE_LINE_RE = re.compile(HEREDOC_CLOSE_LINE_RE_PATTERN)
 
 
 def parse(text: str) -> CPFDocument:
@@ -32,75 +41,58 @@ def parse(text: str) -> CPFDocument:
 
     Raises ParseError on malformed input.
     """
-    lines = text.splitlines()
-    if not lines:
+    text = normalize_newlines(text)
+    if not text:
         raise ParseError(1, "Empty document")
 
+    # The three header lines, plus the rest of the document
+    head = text.split("\n", 3)
+
     # Line 1: format header
-    if lines[0].strip() != FORMAT_HEADER:
-        raise ParseError(1, f"Expected '{FORMAT_HEADER}', got '{lines[0].strip()}'")
+    if head[0].strip() != FORMAT_HEADER:
+        raise ParseError(1, f"Expected '{FORMAT_HEADER}', got '{head[0].strip()}'")
 
     # Line 2: metadata
-    if len(lines) < 2 or not lines[1].strip().startswith(METADATA_PREFIX):
+    meta_line = head[1].strip() if len(head) > 1 else ""
+    if not meta_line.startswith(METADATA_PREFIX):
         raise ParseError(2, f"Expected metadata line starting with '{METADATA_PREFIX}'")
 
-    metadata = _parse_metadata(lines[1].strip(), 2)
+    metadata = _parse_metadata(meta_line, 2)
 
     # Line 3: separator
-    if len(lines) < 3 or lines[2].strip() != SECTION_SEPARATOR:
+    if len(head) < 3 or head[2].strip() != SECTION_SEPARATOR:
         raise ParseError(3, f"Expected '{SECTION_SEPARATOR}' separator")
 
-    # Lines 4+: blocks
+    # Lines 4+: blocks. Only header lines are visited; anything before the
+    # first block is an orphan line and skipped silently. Searches start at
+    # the "\n" ending the previous line (here, line 3).
     blocks: list[Block] = []
-    i = 3
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # Skip empty lines between blocks
-        if not line:
-            i += 1
-            continue
-
-        # Check for block start
-        match = _BLOCK_RE.match(line)
-        if match:
-            sigil = match.group(1)
-            block_id = match.group(2).strip()
-
-            if sigil not in SIGILS:
-                raise ParseError(i + 1, f"Unknown sigil '{sigil}'. Valid: {', '.join(SIGILS)}")
-
-            block = Block(sigil=sigil, block_id=block_id)
-
-            # For blob blocks, handle heredoc
-            if sigil == "B":
-                i += 1
-                i, heredoc_lines = _parse_heredoc(lines, i)
-                block.lines = heredoc_lines
-                block.is_heredoc = True
-            else:
-                # Read content lines until next block or EOF
-                i += 1
-                while i < len(lines):
-                    content_line = lines[i]
-                    # Check if next block starts
-                    if _BLOCK_RE.match(content_line.strip()):
-                        break
-                    # Skip empty lines at start of block
-                    if not block.lines and not content_line.strip():
-                        i += 1
-                        continue
-                    block.lines.append(content_line.rstrip())
-                    i += 1
-
-                # Strip trailing empty lines from block
-                while block.lines and not block.lines[-1].strip():
-                    block.lines.pop()
-
-            blocks.append(block)
+    match = _BLOCK_LINE_RE.search(text, len(head[0]) + len(head[1]) + len(head[2]) + 2)
+    while match:
+        sigil = match.group(1)
+        block_id = match.group(2).strip()
+
+        if sigil not in SIGILS:
+            raise ParseError(
+                _line_number(text, match.start() + 1),
+                f"Unknown sigil '{sigil}'. Valid: {', '.join(SIGILS)}",
+            )
+
+        block = Block(sigil=sigil, block_id=block_id)
+        body_start = match.end() + 1
+
+        # For blob blocks, handle heredoc
+        if sigil == "B":
+            next_pos, block.lines = _parse_heredoc(text, body_start)
+            block.is_heredoc = True
+            match = _BLOCK_LINE_RE.search(text, next_pos)
         else:
-            # Orphan line outside a block — skip silently
-            i += 1
+            # Content runs until the next block header or EOF
+            match = _BLOCK_LINE_RE.search(text, match.end())
+            body_end = match.start() + 1 if match else len(text)
+            block.lines = _content_lines(text[body_start:body_end])
+
+        blocks.append(block)
 
     return CPFDocument(
         version="v1",
@@ -109,6 +101,22 @@ def parse(text: str) -> CPFDocument:
     )
 
 
+def _line_number(text: str, pos: int) -> int:
+    """1-based number of the line containing offset `pos`."""
+    return text.count("\n", 0, pos) + 1
+
+
+def _content_lines(body: str) -> list[str]:
+    """Right-stripped lines of a block body, without leading/trailing blank lines."""
+    lines = [line.rstrip() for line in body.splitlines()]
+    start, end = 0, len(lines)
+    while start < end and not lines[start]:
+        start += 1
+    while end > start and not lines[end - 1]:
+        end -= 1
+    return lines[start:end]
+
+
 def _parse_metadata(line: str, line_num: int) -> Metadata:
     """Parse M|id|title|source|timestamp into Metadata."""
     parts = line[len(METADATA_PREFIX):].split("|")
@@ -125,17 +133,21 @@ def _parse_metadata(line: str, line_num: int) -> Metadata:
     )
 
 
-def _parse_heredoc(lines: list[str], start: int) -> tuple[int, list[str]]:
-    """Parse a heredoc block starting at `start`. Returns (next_line_index, content_lines)."""
-    if start >= len(lines) or lines[start].strip() != HEREDOC_OPEN:
-        raise ParseError(start + 1, f"Expected '{HEREDOC_OPEN}' to start heredoc block")
+def _parse_heredoc(text: str, start: int) -> tuple[int, list[str]]:
+    """Parse a heredoc whose "<<" line starts at offset `start`.
 
-    content: list[str] = []
-    i = start + 1
-    while i < len(lines):
-        if lines[i].strip() == HEREDOC_CLOSE:
-            return i + 1, content
-        content.append(lines[i].rstrip())
-        i += 1
-
-    raise ParseError(start + 1, f"Unclosed heredoc block (missing '{HEREDOC_CLOSE}')")
+    Returns (offset of the "\n" ending the ">>" line, content_lines).
+    """
+    # The line after the block header, even when the document ends there
+    line_num = _line_number(text, start - 1) + 1
+    open_end = text.find("\n", start)
+    if open_end == -1:
+        open_end = len(text)
+    if start >= len(text) or text[start:open_end].strip() != HEREDOC_OPEN:
+        raise ParseError(line_num, f"Expected '{HEREDOC_OPEN}' to start heredoc block")
+
+    close = _HEREDOC_CLOSE_LINE_RE.search(text, open_end)
+    if close is None:
+        raise ParseError(line_num, f"Unclosed heredoc block (missing '{HEREDOC_CLOSE}')")
+    content = [line.rstrip() for line in text[open_end + 1:close.start() + 1].splitlines()]
+    return close.end(), content
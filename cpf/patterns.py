@@ -89,16 +89,26 @@ AND_CONNECTOR_RE = re.compile(r"\b(?:and|also|as well as|along with|plus)\b", re
 OR_CONNECTOR_RE = re.compile(r"\b(?:\bor\b|alternatively)\b", re.I)
 
 # Filler words that can be dropped without semantic loss
-FILLER_WORDS = re.compile(
-    r"\b(please|basically|essentially|simply|just|that is|in order to|"
-    r"make sure to|be sure to|it is important to|you should|you must|"
-    r"we need to|we should|there is|there are|this is|that are|which is|"
-    r"which are|in this case|at this point|for this purpose)\b",
-    re.I,
+FILLER_PHRASES: tuple[str, ...] = (
+    "please", "basically", "essentially", "simply", "just", "that is", "in order to",
+    "make sure to", "be sure to", "it is important to", "you should", "you must",
+    "we need to", "we should", "there is", "there are", "this is", "that are", "which is",
+    "which are", "in this case", "at this point", "for this purpose",
 )
+FILLER_WORDS = re.compile(r"\b(" + "|".join(FILLER_PHRASES) + r")\b", re.I)
 
 # Articles
-ARTICLES_RE = re.compile(r"\b(a|an|the)\b\s*", re.I)
+ARTICLES: tuple[str, ...] = ("a", "an", "the")
+ARTICLES_RE = re.compile(r"\b(" + "|".join(ARTICLES) + r")\b\s*", re.I)
+
+# Negation, conditional and numbered lines for classify_section. They begin
+# with different words, so at most one branch matches and m.lastgroup
+# names it.
+_CONTENT_FORM_RE = re.compile(
+    f"(?P<negation>(?i:{NEGATION_LINE_RE.pattern}))"
+    f"|(?P<conditional>(?i:{CONDITIONAL_RE.pattern}))"
+    f"|(?P<numbered>{NUMBERED_RE.pattern})"
+)
 
 
 def classify_section(header: str, lines: list[str]) -> str:
@@ -120,14 +130,21 @@ def classify_section(header: str, lines: list[str]) -> str:
     if NEGATION_HEADERS.search(header_lower):
         return "N"
 
-    # Content analysis: count dominant patterns
-    negation_count = sum(1 for l in lines if NEGATION_LINE_RE.match(l.strip()))
-    conditional_count = sum(1 for l in lines if CONDITIONAL_RE.match(l.strip()))
-    numbered_count = sum(1 for l in lines if NUMBERED_RE.match(l.strip()))
-
-    total = len([l for l in lines if l.strip()])
+    # Content analysis: count dominant patterns, stripping each line once
+    counts = {"negation": 0, "conditional": 0, "numbered": 0}
+    total = 0
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        total += 1
+        m = _CONTENT_FORM_RE.match(stripped)
+        if m:
+            counts[m.lastgroup] += 1
     if total == 0:
         return "R"
+    negation_count = counts["negation"]
+    numbered_count = counts["numbered"]
 
     # If >60% negation lines, it's a negation block
     if negation_count > 0 and negation_count / total > 0.6:
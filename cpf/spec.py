@@ -42,3 +42,12 @@ HEREDOC_OPEN = "<<"
 HEREDOC_CLOSE = ">>"
 
 BLOCK_RE_PATTERN = r"^@([A-Z]):(.+)$"
+
+# Multiline forms for scanning a whole document: a block header line and a
+# heredoc close line, each allowing the surrounding whitespace that per-line
+# .strip() used to remove (group 2 of the block form still needs .strip()).
+# A match starts at the "\n" *before* the line: with a literal first
+# character `re` can skip ahead to candidates, whereas a leading (?m)^ is
+# retried at every offset.
+BLOCK_LINE_RE_PATTERN = r"(?m)\n[^\S\n]*@([A-Z]):(.*\S)[^\S\n]*$"
+HEREDOC_CLOSE_LINE_RE_PATTERN = r"(?m)\n[^\S\n]*>>[^\S\n]*$"
@@ -8,14 +8,16 @@ compact CPF lines optimized for LLM consumption.
 from __future__ import annotations
 
 import re
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
 
-from .abbreviations import ENCODE_MAP
+from .abbreviations import ENCODE_MAP, trie_alternation
 from .patterns import (
     AND_CONNECTOR_RE,
-    ARTICLES_RE,
+    ARTICLES,
     BOLD_KV_RE,
     CONDITIONAL_RE,
-    FILLER_WORDS,
+    FILLER_PHRASES,
     IMPERATIVE_RE,
     NEGATION_LINE_RE,
     NUMBERED_RE,
@@ -26,68 +28,127 @@ from .utils import collapse_whitespace, strip_bullet_prefix, strip_markdown_form
 
 
 # Additional filler/grammar to strip for aggressive compression
-_PRONOUNS_RE = re.compile(
-    r"\b(you|your|yours|we|our|they|their|them|it|its|this|that|these|those|"
-    r"which|who|whom|whose)\b\s*",
+_PRONOUNS: tuple[str, ...] = (
+    "you", "your", "yours", "we", "our", "they", "their", "them", "it", "its", "this",
+    "that", "these", "those", "which", "who", "whom", "whose",
+)
+
+# Filler phrases, articles and pronouns, deleted in a single scan. Each list
+# is factored as a trie; filler is tried first at any position. An article or
+# pronoun also takes the whitespace after it, including any filler phrases in
+# that run, just as when filler was deleted in an earlier pass.
+_FILLER_ALT = trie_alternation(FILLER_PHRASES)
+_FILLER_RUN = r"(?:\s|\b(?:" + _FILLER_ALT + r")\b)*"
+_DROP_WORDS_RE = re.compile(
+    r"\b(?:(?:" + _FILLER_ALT + r")\b"
+    r"|(?:" + trie_alternation(ARTICLES) + r")\b" + _FILLER_RUN
+    + r"|(?:" + trie_alternation(_PRONOUNS) + r")\b" + _FILLER_RUN + ")",
     re.I,
 )
 
-# Verbose phrases to collapse
-_VERBOSE_PHRASES: list[tuple[re.Pattern, str]] = [
-    (re.compile(r"\bfor example\b", re.I), "e.g."),
-    (re.compile(r"\bfor instance\b", re.I), "e.g."),
-    (re.compile(r"\bsuch as\b", re.I), "e.g."),
+# Phrases collapsed before all others, one pass each and in this order:
+# "results in order to" must keep "in order to", and the "to" it leaves
+# can complete a later phrase ("needs in order to be" -> "needs to be").
+_LEADING_PHRASES: tuple[tuple[re.Pattern[str], str], ...] = (
     (re.compile(r"\bin order to\b", re.I), "to"),
-    (re.compile(r"\bso that\b", re.I), "so"),
-    (re.compile(r"\bas well as\b", re.I), "+"),
-    (re.compile(r"\balong with\b", re.I), "+"),
     (re.compile(r"\bin addition to\b", re.I), "+"),
-    (re.compile(r"\bwith respect to\b", re.I), "re:"),
-    (re.compile(r"\bwith regard to\b", re.I), "re:"),
-    (re.compile(r"\bregarding\b", re.I), "re:"),
-    (re.compile(r"\bis required\b", re.I), "req"),
-    (re.compile(r"\bare required\b", re.I), "req"),
-    (re.compile(r"\bis not\b", re.I), "!"),
-    (re.compile(r"\bare not\b", re.I), "!"),
-    (re.compile(r"\bdo not\b", re.I), "!!"),
-    (re.compile(r"\bshould not\b", re.I), "!!"),
-    (re.compile(r"\bmust not\b", re.I), "!!"),
-    (re.compile(r"\bcan not\b", re.I), "!!"),
-    (re.compile(r"\bcannot\b", re.I), "!!"),
-    (re.compile(r"\bshould be\b", re.I), "=>"),
-    (re.compile(r"\bneeds to be\b", re.I), "=>"),
-    (re.compile(r"\bhas to be\b", re.I), "=>"),
-    (re.compile(r"\bwhen possible\b", re.I), "[possible]"),
-    (re.compile(r"\bwhere appropriate\b", re.I), "[appropriate]"),
-    (re.compile(r"\bwhere needed\b", re.I), "[needed]"),
-    (re.compile(r"\bif needed\b", re.I), "[needed]"),
-    (re.compile(r"\bif applicable\b", re.I), "[applicable]"),
-    (re.compile(r"\bwhen relevant\b", re.I), "[relevant]"),
-    (re.compile(r"\bif relevant\b", re.I), "[relevant]"),
-    (re.compile(r"\bat least\b", re.I), ">="),
-    (re.compile(r"\bat minimum\b", re.I), ">="),
-    (re.compile(r"\bat most\b", re.I), "<="),
-    (re.compile(r"\bmore than\b", re.I), ">"),
-    (re.compile(r"\bless than\b", re.I), "<"),
-    (re.compile(r"\bgreater than\b", re.I), ">"),
-    (re.compile(r"\bresults? in\b", re.I), "=>"),
-    (re.compile(r"\bleads? to\b", re.I), "=>"),
-    (re.compile(r"\bsee\s+", re.I), "@>"),
-    (re.compile(r"\brefer to\b", re.I), "@>"),
-    (re.compile(r"\bmake sure\b", re.I), "ensure"),
-    (re.compile(r"\bbe sure to\b", re.I), "ensure"),
-]
+)
+
+# Other verbose phrases to collapse, matched case-insensitively as whole
+# words. None of them overlaps another's tail or is completed by another's
+# replacement, so one leftmost pass gives the same result as applying
+# them one by one.
+_VERBOSE_PHRASES: dict[str, str] = {
+    "for example": "e.g.",
+    "for instance": "e.g.",
+    "such as": "e.g.",
+    "so that": "so",
+    "as well as": "+",
+    "along with": "+",
+    "with respect to": "re:",
+    "with regard to": "re:",
+    "regarding": "re:",
+    "is required": "req",
+    "are required": "req",
+    "is not": "!",
+    "are not": "!",
+    "do not": "!!",
+    "should not": "!!",
+    "must not": "!!",
+    "can not": "!!",
+    "cannot": "!!",
+    "should be": "=>",
+    "needs to be": "=>",
+    "has to be": "=>",
+    "when possible": "[possible]",
+    "where appropriate": "[appropriate]",
+    "where needed": "[needed]",
+    "if needed": "[needed]",
+    "if applicable": "[applicable]",
+    "when relevant": "[relevant]",
+    "if relevant": "[relevant]",
+    "at least": ">=",
+    "at minimum": ">=",
+    "at most": "<=",
+    "more than": ">",
+    "less than": "<",
+    "greater than": ">",
+    "result in": "=>",
+    "results in": "=>",
+    "lead to": "=>",
+    "leads to": "=>",
+    "refer to": "@>",
+    "make sure": "ensure",
+    "be sure to": "ensure",
+}
+# "see" followed by whitespace; the whitespace is dropped with it
+_SEE_RE = re.compile(r"\bsee\s+", re.I)
+
+# Whitespace around an operator, removed in one pass. Here and in the
+# trailing-fluff and edge-space patterns, a run of whitespace or
+# punctuation is only entered at its first character ("\s(?<!\s\s)")
+# and then consumed possessively: a bare leading \s* is retried at every
+# offset of a long run, which is quadratic.
+_OPERATOR_SPACING_RE = re.compile(r"(?:\s(?<!\s\s)\s*+)?(\+|\||->|=>|::)\s*+")
+
+# Structural line forms in priority order, fused into one anchored
+# alternation; each branch is a named group wrapping the original pattern
+# (with its own flags), so m.lastgroup names the form that matched.
+_LINE_FORMS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("conditional", CONDITIONAL_RE),
+    ("negation", NEGATION_LINE_RE),
+    ("imperative", IMPERATIVE_RE),
+    ("prefer", PREFER_RE),
+    ("bold_kv", BOLD_KV_RE),
+    ("numbered", NUMBERED_RE),
+)
+_LINE_FORM_RE = re.compile("|".join(
+    f"(?P<{name}>(?i:{pattern.pattern}))" if pattern.flags & re.I
+    else f"(?P<{name}>{pattern.pattern})"
+    for name, pattern in _LINE_FORMS
+))
 
 # Sentence-ending fluff to strip
 _TRAILING_FLUFF = re.compile(
-    r"\s*[.;,]+\s*$"
+    r"(?:\s(?<!\s\s)\s*+[.;,]|[.;,](?<![.;,][.;,]))[.;,]*+\s*+$"
 )
 
 # Multiple consecutive punctuation/operators
 _MULTI_OPERATORS = re.compile(r"([+|;])\1+")
 
+# compress_lines joins fragments with this sentinel. It is neither
+# whitespace nor a word character, so no compression pattern spans it
+# ("\x1f" would not do: str.isspace() and regex \s both accept it).
+_FRAGMENT_SEP = "\x00"
+# Sentinel-aware forms of the per-fragment trailing-fluff and strip() steps
+_JOINED_TRAILING_FLUFF = re.compile(
+    r"(?:\s(?<!\s\s)\s*+[.;,]|[.;,](?<![.;,][.;,]))[.;,]*+\s*+(?=\x00|\Z)"
+)
+_JOINED_EDGE_SPACE = re.compile(r"\s(?:(?<!\s\s)\s*+(?=\x00|\Z)|(?<=\x00\s)\s*+|(?<=^\s)\s*+)")
+_SPACES_RE = re.compile(r"[ \t]+")
+
 
-def compress_line(line: str, encode_map: dict[str, str] | None = None) -> str:
+def compress_line(line: str, encode_map: Mapping[str, str] | None = None) -> str:
     """Compress a single English instruction line into CPF notation.
 
     Pipeline:
@@ -98,87 +159,110 @@ def compress_line(line: str, encode_map: dict[str, str] | None = None) -> str:
     5. Apply abbreviation dictionary
     6. Collapse whitespace and clean up
     """
-    if not line.strip():
-        return ""
+    if not encode_map or encode_map is ENCODE_MAP:
+        return _compress_line_default(line)
+    return _compress_line(line, encode_map)
+
+
+@lru_cache(maxsize=8192)
+def _compress_line_default(line: str) -> str:
+    """compress_line with the built-in map; templated documents repeat lines."""
+    return _compress_line(line, ENCODE_MAP)
+
+
+def _compress_line(line: str, abbrevs: Mapping[str, str]) -> str:
+    """Compress one line with the given abbreviation map (uncached)."""
+    template, parts = _line_shape(line)
+    return template.format(*[_compress_fragment(part, abbrevs) for part in parts])
+
+
+def compress_lines(lines: Iterable[str], encode_map: Mapping[str, str] | None = None) -> list[str]:
+    """Compress many lines at once; same results as compress_line per line.
+
+    The fragments of all lines are joined with a sentinel and each
+    compression pass runs once over the joined text, instead of once per
+    fragment. With the built-in map, lines come from compress_line's cache.
+    """
+    if not encode_map or encode_map is ENCODE_MAP:
+        # Templated documents repeat lines; serve them from the line cache
+        return [_compress_line_default(line) for line in lines]
+    abbrevs = encode_map
+    shapes = [_line_shape(line) for line in lines]
+    fragments = [part for _, parts in shapes for part in parts]
+    if not fragments:
+        return [template for template, _ in shapes]
+
+    joined = _FRAGMENT_SEP.join(fragments)
+    if _FRAGMENT_SEP in "".join(abbrevs) or joined.count(_FRAGMENT_SEP) != len(fragments) - 1:
+        # The sentinel occurs in the input itself; compress one by one
+        compressed = [_compress_fragment(part, abbrevs) for part in fragments]
+    else:
+        compressed = _compress_joined(joined, abbrevs)
+
+    results: list[str] = []
+    pos = 0
+    for template, parts in shapes:
+        results.append(template.format(*compressed[pos:pos + len(parts)]))
+        pos += len(parts)
+    return results
+
+
+def _line_shape(line: str) -> tuple[str, tuple[str, ...]]:
+    """Split a line into a format template and the fragments to compress.
+
+    "If X: Y" gives ("?{}->{}", ("X", "Y")); the compressed fragments are
+    substituted into the template.
+    """
+    # str.isspace() rejects blank lines without building a stripped copy
+    if not line or line.isspace():
+        return "", ()
 
-    abbrevs = encode_map or ENCODE_MAP
     text = strip_bullet_prefix(line)
     text = strip_markdown_formatting(text)
 
     # --- Pattern-based structural replacements ---
 
+    # One match picks the line form; branches are tried in priority order
+    m = _LINE_FORM_RE.match(text)
+    if m is None:
+        # Default: apply aggressive compression
+        return "{}", (text,)
+    form = m.lastgroup
+    # Group n of the form's own pattern is group base + n here
+    base = _LINE_FORM_RE.groupindex[form]
+
     # Conditional: "If X: Y" -> "?X->Y"
-    m = CONDITIONAL_RE.match(text)
-    if m:
-        condition = m.group(1).strip().rstrip(":")
-        action = m.group(2).strip().rstrip(".")
-        condition = _compress_fragment(condition, abbrevs)
-        action = _compress_fragment(action, abbrevs)
-        return f"?{condition}->{action}"
+    if form == "conditional":
+        condition = m.group(base + 1).strip().rstrip(":")
+        action = m.group(base + 2).strip().rstrip(".")
+        return "?{}->{}", (condition, action)
 
     # Negation: "Do NOT X" / "Never X" -> "!!X"
-    m = NEGATION_LINE_RE.match(text)
-    if m:
-        content = m.group(1).strip().rstrip(".")
-        content = _compress_fragment(content, abbrevs)
-        return f"!!{content}"
+    if form == "negation":
+        return "!!{}", (m.group(base + 1).strip().rstrip("."),)
 
     # Imperative: "Always X" / "Must X" -> "*X"
-    m = IMPERATIVE_RE.match(text)
-    if m:
-        content = m.group(1).strip().rstrip(".")
-        content = _compress_fragment(content, abbrevs)
-        return f"*{content}"
+    if form == "imperative":
+        return "*{}", (m.group(base + 1).strip().rstrip("."),)
 
     # Prefer: "Prefer X over Y" -> "prefer(X)>Y"
-    m = PREFER_RE.match(text)
-    if m:
-        preferred = _compress_fragment(m.group(1).strip(), abbrevs)
-        over = _compress_fragment(m.group(2).strip().rstrip("."), abbrevs)
-        return f"prefer({preferred})>{over}"
+    if form == "prefer":
+        return "prefer({})>{}", (m.group(base + 1).strip(), m.group(base + 2).strip().rstrip("."))
 
     # Bold key-value: "**Key:** value" -> "key::value"
-    m = BOLD_KV_RE.match(text)
-    if m:
-        key = _compress_fragment(m.group(1).strip(), abbrevs)
-        val = _compress_fragment(m.group(2).strip().rstrip("."), abbrevs)
-        return f"{key}::{val}"
+    if form == "bold_kv":
+        return "{}::{}", (m.group(base + 1).strip(), m.group(base + 2).strip().rstrip("."))
 
     # Numbered: "1. Something" -> "#1 something"
-    m = NUMBERED_RE.match(text)
-    if m:
-        num = m.group(1)
-        content = _compress_fragment(m.group(2).strip().rstrip("."), abbrevs)
-        return f"#{num} {content}"
-
-    # Default: apply aggressive compression
-    return _compress_fragment(text, abbrevs)
+    return "#" + m.group(base + 1) + " {}", (m.group(base + 2).strip().rstrip("."),)
 
 
-def _compress_fragment(text: str, abbrevs: dict[str, str]) -> str:
+def _compress_fragment(text: str, abbrevs: Mapping[str, str]) -> str:
     """Apply aggressive compression to a text fragment.
 
     Designed for LLM consumption: strips all grammar that LLMs can infer.
     """
-    # Apply verbose phrase replacements first (multi-word -> operator)
-    for pattern, replacement in _VERBOSE_PHRASES:
-        text = pattern.sub(replacement, text)
-
-    # Remove filler words
-    text = FILLER_WORDS.sub("", text)
-
-    # Remove articles
-    text = ARTICLES_RE.sub("", text)
-
-    # Remove pronouns (LLMs infer subject from context)
-    text = _PRONOUNS_RE.sub("", text)
-
-    # Replace connectors
-    text = AND_CONNECTOR_RE.sub("+", text)
-    text = OR_CONNECTOR_RE.sub("|", text)
-
-    # Apply abbreviations (whole-word, case-insensitive)
-    text = _apply_abbreviations(text, abbrevs)
+    text = _reduce_words(text, abbrevs)
 
     # Strip trailing punctuation fluff
     text = _TRAILING_FLUFF.sub("", text)
@@ -187,11 +271,7 @@ def _compress_fragment(text: str, abbrevs: dict[str, str]) -> str:
     text = collapse_whitespace(text)
 
     # Clean up operator spacing
-    text = re.sub(r"\s*\+\s*", "+", text)
-    text = re.sub(r"\s*\|\s*", "|", text)
-    text = re.sub(r"\s*->\s*", "->", text)
-    text = re.sub(r"\s*=>\s*", "=>", text)
-    text = re.sub(r"\s*::\s*", "::", text)
+    text = _OPERATOR_SPACING_RE.sub(r"\1", text)
 
     # Remove duplicate operators
     text = _MULTI_OPERATORS.sub(r"\1", text)
@@ -202,17 +282,86 @@ def _compress_fragment(text: str, abbrevs: dict[str, str]) -> str:
     return text
 
 
-def _apply_abbreviations(text: str, abbrevs: dict[str, str]) -> str:
+def _compress_joined(joined: str, abbrevs: Mapping[str, str]) -> list[str]:
+    """_compress_fragment over sentinel-joined fragments, one pass per step.
+
+    None of the word-level patterns can match across the sentinel; only
+    the steps anchored to a fragment's ends need sentinel-aware forms.
+    """
+    text = _reduce_words(joined, abbrevs)
+    text = _JOINED_TRAILING_FLUFF.sub("", text)
+    text = _JOINED_EDGE_SPACE.sub("", _SPACES_RE.sub(" ", text))
+    text = _OPERATOR_SPACING_RE.sub(r"\1", text)
+    text = _MULTI_OPERATORS.sub(r"\1", text)
+    return [part.strip(" +|;,.") for part in text.split(_FRAGMENT_SEP)]
+
+
+def _reduce_words(text: str, abbrevs: Mapping[str, str]) -> str:
+    """Drop filler words and swap phrases, connectors and abbreviations."""
+    # Apply verbose phrase replacements first (multi-word -> operator)
+    for leading, replacement in _LEADING_PHRASES:
+        text = leading.sub(replacement, text)
+    pattern, repl = _VERBOSE_MATCHER
+    text = _SEE_RE.sub("@>", pattern.sub(repl, text))
+
+    # Remove filler words, articles and pronouns (LLMs infer subject from
+    # context)
+    text = _DROP_WORDS_RE.sub("", text)
+
+    # Replace connectors
+    text = AND_CONNECTOR_RE.sub("+", text)
+    text = OR_CONNECTOR_RE.sub("|", text)
+
+    # Apply abbreviations (whole-word, case-insensitive)
+    return _apply_abbreviations(text, abbrevs)
+
+
+def _apply_abbreviations(text: str, abbrevs: Mapping[str, str]) -> str:
     """Replace whole words with their abbreviations.
 
     Handles multi-word phrases first (e.g. 'dependency injection' -> 'di'),
     then single words. Case-insensitive matching.
     """
-    # Sort by length descending so multi-word phrases match first
-    sorted_entries = sorted(abbrevs.items(), key=lambda x: len(x[0]), reverse=True)
-
-    for full, abbr in sorted_entries:
-        pattern = r"\b" + re.escape(full) + r"\b"
-        text = re.sub(pattern, abbr, text, flags=re.I)
-
-    return text
+    matcher = _phrase_matcher(tuple(abbrevs.items()))
+    if matcher is None:
+        return text
+    pattern, repl = matcher
+    return pattern.sub(repl, text)
+
+
+@lru_cache(maxsize=32)
+def _phrase_matcher(
+    entries: tuple[tuple[str, str], ...],
+) -> tuple[re.Pattern[str], Callable[[re.Match[str]], str]] | None:
+    """Compile one whole-word, case-insensitive matcher for phrase -> replacement.
+
+    The phrases form a single trie alternation, so a fragment is scanned
+    once and the longest phrase at each position wins. Keyed on the map's
+    items in order: of two phrases differing only in case, the first one
+    (as with a stable longest-first sort) supplies the abbreviation.
+    """
+    if not entries:
+        return None
+    ordered = sorted(entries, key=lambda x: len(x[0]), reverse=True)
+    lookup: dict[str, str] = {}
+    for full, abbr in ordered:
+        lookup.setdefault(full.casefold(), abbr)
+
+    def repl(m: re.Match[str]) -> str:
+        abbr = lookup.get(m[0].casefold())
+        if abbr is None:
+            # re.I matched a case variant that casefold() maps differently
+            # (e.g. dotted capital I); fall back to the phrase's own regex
+            abbr = next(
+                a for full, a in ordered if re.fullmatch(re.escape(full), m[0], re.I)
+            )
+        return abbr
+
+    # Case variants must share trie branches: with re.I a "W..." branch and
+    # a "w..." branch both match, and the first one tried may be the shorter
+    pattern = re.compile(r"\b(?:" + trie_alternation({full.lower() for full, _ in entries}) + r")\b", re.I)
+    return pattern, repl
+
+
+# Built once at import; the table never changes
+_VERBOSE_MATCHER = _phrase_matcher(tuple(_VERBOSE_PHRASES.items()))
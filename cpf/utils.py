@@ -4,6 +4,32 @@ from __future__ import annotations
 
 import re
 
+# Patterns used by the helpers below, compiled once at import
+_HEADING_MARKER_RE = re.compile(r"^#+\s*")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_HYPHEN_RUN_RE = re.compile(r"-+")
+_ITALIC_STAR_RE = re.compile(r"(?<!\*)\*(?!\*)(.*?)(?<!\*)\*(?!\*)")
+_ITALIC_UNDERSCORE_RE = re.compile(r"(?<!_)_(?!_)(.*?)(?<!_)_(?!_)")
+_ARTICLES_RE = re.compile(r"\b(a|an|the)\b\s*", re.IGNORECASE)
+_SPACES_RE = re.compile(r"[ \t]+")
+_NUMBERED_ITEM_RE = re.compile(r"^\s*(\d+)\.\s+(.+)$")
+_SECTION_HEADER_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+# Line boundaries other than "\n" that str.splitlines() also honours
+_OTHER_LINE_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def normalize_newlines(text: str) -> str:
+    """Rewrite every str.splitlines() line boundary as "\\n".
+
+    Afterwards multiline regexes and offset arithmetic on the buffer see
+    the same lines that text.splitlines() would produce.
+    """
+    # One substring test per character beats a regex character class here
+    if any(ch in text for ch in _OTHER_LINE_BREAKS):
+        # The trailing newline keeps a final empty line ("a\r\r") intact
+        return "\n".join(text.splitlines()) + "\n"
+    return text
+
 
 def slugify(text: str) -> str:
     """Convert a section header to a kebab-case block ID.
@@ -12,15 +38,15 @@ def slugify(text: str) -> str:
     '## Git and PR standards' -> 'git-pr-standards'
     """
     # Strip markdown heading markers
-    text = re.sub(r"^#+\s*", "", text)
+    text = _HEADING_MARKER_RE.sub("", text)
     # Strip bold markers
     text = text.replace("**", "")
     # Lowercase
     text = text.lower().strip()
     # Replace non-alphanum with hyphens
-    text = re.sub(r"[^a-z0-9]+", "-", text)
+    text = _NON_ALNUM_RE.sub("-", text)
     # Collapse multiple hyphens
-    text = re.sub(r"-+", "-", text)
+    text = _HYPHEN_RUN_RE.sub("-", text)
     # Strip leading/trailing hyphens
     return text.strip("-")
 
@@ -29,35 +55,37 @@ def strip_markdown_formatting(text: str) -> str:
     """Remove markdown bold/italic markers from text."""
     text = text.replace("**", "")
     text = text.replace("__", "")
-    # Single * or _ for italic — only strip pairs
-    text = re.sub(r"(?<!\*)\*(?!\*)(.*?)(?<!\*)\*(?!\*)", r"\1", text)
-    text = re.sub(r"(?<!_)_(?!_)(.*?)(?<!_)_(?!_)", r"\1", text)
+    # Single * or _ for italic — only strip pairs. The patterns open with a
+    # lookbehind, which defeats re's literal-prefix search, so most lines
+    # (with no marker at all) skip them on a plain substring test.
+    if "*" in text:
+        text = _ITALIC_STAR_RE.sub(r"\1", text)
+    if "_" in text:
+        text = _ITALIC_UNDERSCORE_RE.sub(r"\1", text)
     return text
 
 
 def strip_articles(text: str) -> str:
     """Remove English articles (a, an, the) that add no semantic value for LLMs."""
-    return re.sub(r"\b(a|an|the)\b\s*", "", text, flags=re.IGNORECASE)
+    return _ARTICLES_RE.sub("", text)
 
 
 def collapse_whitespace(text: str) -> str:
     """Collapse multiple spaces/tabs into single space."""
-    return re.sub(r"[ \t]+", " ", text).strip()
+    return _SPACES_RE.sub(" ", text).strip()
 
 
 def strip_bullet_prefix(line: str) -> str:
     """Remove leading '- ' or '* ' bullet markers."""
     stripped = line.strip()
-    if stripped.startswith("- "):
-        return stripped[2:]
-    if stripped.startswith("* "):
+    if stripped.startswith(("- ", "* ")):
         return stripped[2:]
     return stripped
 
 
 def is_numbered_item(line: str) -> tuple[bool, int, str]:
     """Check if line is a numbered list item. Returns (is_numbered, number, content)."""
-    match = re.match(r"^\s*(\d+)\.\s+(.+)$", line)
+    match = _NUMBERED_ITEM_RE.match(line)
     if match:
         return True, int(match.group(1)), match.group(2)
     return False, 0, line
@@ -65,7 +93,7 @@ def is_numbered_item(line: str) -> tuple[bool, int, str]:
 
 def extract_section_header(line: str) -> str | None:
     """Extract section name from markdown header line (## Header)."""
-    match = re.match(r"^(#{1,6})\s+(.+)$", line.strip())
+    match = _SECTION_HEADER_RE.match(line.strip())
     if match:
         return match.group(2).strip()
     return None
@@ -76,7 +104,7 @@ def count_tokens_estimate(text: str) -> int:
 
     This is a rough heuristic, not an exact tokenizer.
     """
-    # Split on whitespace and punctuation boundaries
-    words = re.findall(r"\S+", text)
+    # Split on whitespace (str.split() and regex \S+ agree on the words)
+    words = text.split()
     # Rough estimate: each word is ~1.3 tokens on average
     return max(1, int(len(words) * 1.3))
@@ -3,20 +3,23 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 from .spec import (
-    BLOCK_RE_PATTERN,
+    BLOCK_LINE_RE_PATTERN,
     FORMAT_HEADER,
     HEREDOC_CLOSE,
+    HEREDOC_CLOSE_LINE_RE_PATTERN,
     HEREDOC_OPEN,
     METADATA_PREFIX,
     SECTION_SEPARATOR,
     SIGILS,
 )
+from .utils import normalize_newlines
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationError:
     """A single validation issue."""
     line: int
@@ -27,107 +30,108 @@ class ValidationError:
         return f"[{self.severity.upper()}] Line {self.line}: {self.message}"
 
 
-_BLOCK_RE = re.compile(BLOCK_RE_PATTERN)
+# Whole-buffer scanners: block headers and heredoc close lines
+_BLOCK_LINE_RE = re.compile(BLOCK_LINE_RE_PATTERN)
+_HEREDOC_CLOSE_LINE_RE = re.compile(HEREDOC_CLOSE_LINE_RE_PATTERN)
 
 
 def validate(text: str) -> list[ValidationError]:
     """Validate a CPF v1 document. Returns list of errors (empty = valid)."""
-    errors: list[ValidationError] = []
-    lines = text.splitlines()
+    return list(_iter_errors(text))
 
-    if not lines:
-        errors.append(ValidationError(1, "Empty document"))
-        return errors
+
+def is_valid(text: str) -> bool:
+    """Quick check: is this a valid CPF document?"""
+    # Stops scanning at the first error instead of collecting all of them
+    return not any(e.severity == "error" for e in _iter_errors(text))
+
+
+def _iter_errors(text: str) -> Iterator[ValidationError]:
+    """Yield the issues in a CPF v1 document in document order."""
+    text = normalize_newlines(text)
+
+    if not text:
+        yield ValidationError(1, "Empty document")
+        return
+
+    # The three header lines, plus the rest of the document
+    head = text.split("\n", 3)
+    if len(head) < 4 and text.endswith("\n"):
+        head.pop()  # splitlines() has no empty line after a final "\n"
 
     # Line 1: format header
-    if lines[0].strip() != FORMAT_HEADER:
-        errors.append(ValidationError(1, f"Expected '{FORMAT_HEADER}', got '{lines[0].strip()}'"))
-        return errors  # Can't continue without valid header
+    if head[0].strip() != FORMAT_HEADER:
+        yield ValidationError(1, f"Expected '{FORMAT_HEADER}', got '{head[0].strip()}'")
+        return  # Can't continue without valid header
 
     # Line 2: metadata
-    if len(lines) < 2:
-        errors.append(ValidationError(2, "Missing metadata line"))
-        return errors
+    if len(head) < 2:
+        yield ValidationError(2, "Missing metadata line")
+        return
 
-    meta_line = lines[1].strip()
+    meta_line = head[1].strip()
     if not meta_line.startswith(METADATA_PREFIX):
-        errors.append(ValidationError(2, f"Expected metadata starting with '{METADATA_PREFIX}'"))
+        yield ValidationError(2, f"Expected metadata starting with '{METADATA_PREFIX}'")
     else:
-        fields = meta_line[len(METADATA_PREFIX):].split("|")
-        if len(fields) < 4:
-            errors.append(ValidationError(
-                2, f"Metadata needs 4 pipe-separated fields, got {len(fields)}"
-            ))
+        # Only the field count matters here; count separators, don't split
+        field_count = meta_line.count("|", len(METADATA_PREFIX)) + 1
+        if field_count < 4:
+            yield ValidationError(
+                2, f"Metadata needs 4 pipe-separated fields, got {field_count}"
+            )
 
     # Line 3: separator
-    if len(lines) < 3:
-        errors.append(ValidationError(3, f"Missing '{SECTION_SEPARATOR}' separator"))
-        return errors
+    if len(head) < 3:
+        yield ValidationError(3, f"Missing '{SECTION_SEPARATOR}' separator")
+        return
 
-    if lines[2].strip() != SECTION_SEPARATOR:
-        errors.append(ValidationError(3, f"Expected '{SECTION_SEPARATOR}', got '{lines[2].strip()}'"))
+    if head[2].strip() != SECTION_SEPARATOR:
+        yield ValidationError(3, f"Expected '{SECTION_SEPARATOR}', got '{head[2].strip()}'")
 
-    # Lines 4+: validate blocks
+    # Lines 4+: validate blocks. Only header lines (and heredoc bounds) are
+    # visited; line numbers are counted forward from the last visited one.
+    # Searches start at the "\n" ending the previous line (here, line 3).
     block_ids: set[str] = set()
-    in_heredoc = False
-    heredoc_start = 0
-    i = 3
-
-    while i < len(lines):
-        line = lines[i].strip()
-
-        if in_heredoc:
-            if line == HEREDOC_CLOSE:
-                in_heredoc = False
-            i += 1
-            continue
-
-        if not line:
-            i += 1
-            continue
-
-        m = _BLOCK_RE.match(line)
-        if m:
-            sigil = m.group(1)
-            block_id = m.group(2).strip()
-
-            if sigil not in SIGILS:
-                errors.append(ValidationError(
-                    i + 1, f"Unknown sigil '{sigil}'. Valid: {', '.join(sorted(SIGILS))}"
-                ))
-
-            if not block_id:
-                errors.append(ValidationError(i + 1, "Block ID is empty"))
-            elif block_id in block_ids:
-                errors.append(ValidationError(
-                    i + 1, f"Duplicate block ID '{block_id}'",
-                    severity="warning",
-                ))
-            block_ids.add(block_id)
-
-            # Check for heredoc in blob blocks
-            if sigil == "B":
-                if i + 1 < len(lines) and lines[i + 1].strip() == HEREDOC_OPEN:
-                    in_heredoc = True
-                    heredoc_start = i + 1
-                    i += 2
-                    continue
-                else:
-                    errors.append(ValidationError(
-                        i + 1, f"@B block must be followed by '{HEREDOC_OPEN}'"
-                    ))
-
-        i += 1
-
-    if in_heredoc:
-        errors.append(ValidationError(
-            heredoc_start + 1,
-            f"Unclosed heredoc block (missing '{HEREDOC_CLOSE}')"
-        ))
-
-    return errors
-
-
-def is_valid(text: str) -> bool:
-    """Quick check: is this a valid CPF document?"""
-    return not any(e.severity == "error" for e in validate(text))
+    pos = counted = len(head[0]) + len(head[1]) + len(head[2]) + 2
+    line_num = 3
+
+    while (m := _BLOCK_LINE_RE.search(text, pos)) is not None:
+        line_num += text.count("\n", counted, m.end())
+        counted = m.end()
+        sigil = m.group(1)
+        block_id = m.group(2).strip()
+
+        if sigil not in SIGILS:
+            yield ValidationError(
+                line_num, f"Unknown sigil '{sigil}'. Valid: {', '.join(sorted(SIGILS))}"
+            )
+
+        if not block_id:
+            yield ValidationError(line_num, "Block ID is empty")
+        elif block_id in block_ids:
+            yield ValidationError(
+                line_num, f"Duplicate block ID '{block_id}'",
+                severity="warning",
+            )
+        block_ids.add(block_id)
+
+        pos = m.end()
+        # Check for heredoc in blob blocks
+        if sigil == "B":
+            start = pos + 1
+            open_end = text.find("\n", start)
+            if open_end == -1:
+                open_end = len(text)
+            if start < len(text) and text[start:open_end].strip() == HEREDOC_OPEN:
+                close = _HEREDOC_CLOSE_LINE_RE.search(text, open_end)
+                if close is None:
+                    yield ValidationError(
+                        line_num + 1,
+                        f"Unclosed heredoc block (missing '{HEREDOC_CLOSE}')"
+                    )
+                    break
+                pos = close.end()
+            else:
+                yield ValidationError(
+                    line_num, f"@B block must be followed by '{HEREDOC_OPEN}'"
+                )
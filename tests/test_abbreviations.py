@@ -1,6 +1,10 @@
 """Tests for the abbreviation dictionary."""
 
-from cpf.abbreviations import abbreviate, expand, ENCODE_MAP, DECODE_MAP
+import re
+
+import pytest
+
+from cpf.abbreviations import abbreviate, expand, trie_alternation, ENCODE_MAP, DECODE_MAP
 
 
 def test_abbreviate_known_word():
@@ -42,3 +46,24 @@ def test_multi_word_abbreviations():
     assert abbreviate("dependency injection") == "di"
     assert abbreviate("pull request") == "pr"
     assert abbreviate("developer experience") == "dx"
+
+
+def test_builtin_maps_are_read_only():
+    with pytest.raises(TypeError):
+        ENCODE_MAP["module"] = "m"
+    with pytest.raises(TypeError):
+        DECODE_MAP["mod"] = "m"
+
+
+def test_decode_map_keeps_first_full_form():
+    # "cfg" is produced by both "configuration" and "configure"
+    assert DECODE_MAP["cfg"] == "configuration"
+
+
+def test_trie_alternation_matches_longest_word():
+    pattern = re.compile(trie_alternation(["mod", "mods", "mw", "a+b"]))
+    assert pattern.pattern == r"(?:a\+b|m(?:od(?:s)?|w))"
+    assert pattern.match("mods").group() == "mods"
+    assert pattern.match("modx").group() == "mod"
+    assert pattern.match("a+b").group() == "a+b"
+    assert pattern.match("mx") is None
@@ -1,8 +1,12 @@
 """Tests for the CLI interface."""
 
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from cpf.cli import main
 
 
@@ -66,3 +70,41 @@ def test_cli_version(capsys):
         main(["--version"])
     except SystemExit:
         pass  # --version causes SystemExit(0)
+
+
+def test_cli_encode_jobs(tmp_path):
+    sections = "\n".join(f"## Section {i}\n\n- Always check the module {i}.\n" for i in range(10))
+    input_file = tmp_path / "input.md"
+    input_file.write_text(f"# Many\n\n{sections}")
+
+    outputs = []
+    for jobs in ("1", "2"):
+        output_file = tmp_path / f"output-{jobs}.cpf"
+        assert main(["encode", str(input_file), "-o", str(output_file), "--jobs", jobs]) == 0
+        outputs.append(output_file.read_text().splitlines())
+    # Metadata lines differ only if the clock ticked between the two runs
+    assert outputs[0][2:] == outputs[1][2:]
+    assert sum(line.startswith("@") for line in outputs[1]) == 10
+
+
+def test_cli_encode_rejects_non_positive_jobs(sample_english, tmp_path):
+    input_file = tmp_path / "input.md"
+    input_file.write_text(sample_english)
+    for jobs in ("0", "-2"):
+        with pytest.raises(SystemExit) as exc:
+            main(["encode", str(input_file), "--jobs", jobs])
+        assert exc.value.code == 2
+
+
+def test_cli_version_skips_codec_imports():
+    code = (
+        "import sys\n"
+        "from cpf.cli import main\n"
+        "try:\n"
+        "    main(['--version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "assert 'cpf.abbreviations' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -72,3 +72,20 @@ function foo() { return 42; }
 """
     result = decode(cpf)
     assert "function foo()" in result
+
+
+def test_expand_prefers_longest_abbreviation():
+    abbrevs = {"mod": "module", "mods": "modules", "upd": "update"}
+    result = expand_line("!!upd mods+mod", abbrevs)
+    assert result == "- Do NOT update modules and module."
+
+
+def test_expand_operators_outside_parens_only():
+    result = expand_line("!!x+(a+b|(c)+d)|e)+f", {})
+    assert result == "- Do NOT x and (a+b|(c)+d) or e) and f."
+
+
+def test_decode_constants_override_custom_and_builtins():
+    text = "CPF|v1\nM|d|D||\n---\n@C:k\nmod::component\n\n@R:r\nmod+plg+wp\n"
+    result = decode(text, custom_decode={"mod": "package", "plg": "extension"})
+    assert "- Component and extension and WordPress." in result
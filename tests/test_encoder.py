@@ -1,6 +1,10 @@
 """Tests for the English -> CPF encoder."""
 
-from cpf.encoder import encode
+from datetime import datetime, timezone
+
+from cpf.abbreviations import ENCODE_MAP
+from cpf.encoder import _encode_body, encode
+from cpf.tokenizer import _compress_line_default, compress_line, compress_lines
 from cpf.validator import is_valid
 
 
@@ -82,3 +86,156 @@ def test_encode_custom_abbreviations():
 """
     result = encode(text, custom_abbrevs={"frobnicator": "frob"})
     assert "frob" in result
+
+
+def test_encode_aliases_repeated_long_paths():
+    text = """# Paths
+
+## Workspace Boundaries
+
+- Read /srv/projects/shared/library/config.yaml first.
+- Never write /srv/projects/shared/library/config.yaml directly.
+- Copy /srv/other/projects/tooling/library/config.yaml to /srv/other/projects/tooling/library/config.yaml
+"""
+    result = encode(text, doc_id="paths", title="Paths")
+    assert "@C:paths" in result
+    assert "$config-yaml::/srv/projects/shared/library/config.yaml" in result
+    assert "$config-yaml1::/srv/other/projects/tooling/library/config.yaml" in result
+    assert is_valid(result)
+
+
+def test_encode_parallel_matches_serial():
+    sections = "\n".join(
+        f"## Section {i}\n\n- Always check the module {i}.\n- Do NOT skip step {i}.\n"
+        for i in range(10)
+    )
+    text = f"# Many\n\n{sections}"
+    serial = encode(text, doc_id="many", title="Many")
+    parallel = encode(text, doc_id="many", title="Many", jobs=2)
+    # Metadata lines differ only if the clock ticked between the two calls
+    assert serial.splitlines()[2:] == parallel.splitlines()[2:]
+    assert serial.count("@") == 10
+
+
+def test_encode_crlf_matches_lf():
+    text = "# Doc\n\n## Rules\n- Never modify core\n  ###  Spaced header  \n- Check cache\n"
+    assert encode(text.replace("\n", "\r\n"), doc_id="d").split("\n")[2:] == \
+        encode(text, doc_id="d").split("\n")[2:]
+    assert "@R:spaced-header" in encode(text)
+
+
+def test_encode_timestamp_is_current_utc_second():
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    stamp = encode("## Rules\n- Check cache\n").split("\n")[1].split("|")[4]
+    after = datetime.now(timezone.utc)
+    parsed = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    assert before <= parsed <= after
+
+
+def test_encode_custom_phrase_beats_shorter_word():
+    text = "## Rules\n- Use dependency injection everywhere\n"
+    result = encode(text, custom_abbrevs={"dependency injection": "di"})
+    assert "Use di everywhere" in result
+
+
+def test_encode_collapses_verbose_phrases():
+    text = "## Rules\n- Check logs as well as metrics in order to spot regressions, for example timeouts\n"
+    assert "chk logs+metrics to spot regressions, e.g. timeouts" in encode(text)
+
+
+def test_compress_line_verbose_phrases_any_case_and_plural():
+    assert compress_line("Retries Results In duplicates; See   the runbook") == (
+        "Retries=>duplicates; @>runbook"
+    )
+    assert compress_line("Build leads to artifacts") == "Build=>artifacts"
+
+
+def test_compress_line_verbose_phrases_keep_table_precedence():
+    # "in order to" wins over an earlier-starting "results in"
+    assert compress_line("Sort the results in order to find duplicates") == (
+        "Sort results to find duplicates"
+    )
+    for encode_map in (None, dict(ENCODE_MAP)):
+        assert compress_lines(["Group results in order to reduce noise"], encode_map) == [
+            "Group results to reduce noise"
+        ]
+    # ...and the "to" it leaves can complete a later phrase
+    assert compress_line("Output needs in order to be sorted") == "Output=>sorted"
+
+
+def test_encode_custom_phrase_extending_builtin_key_any_case():
+    text = "## R\n- Install the WordPress plugin first\n"
+    assert "Install wpp first" in encode(text, custom_abbrevs={"wordpress plugin": "wpp"})
+    assert "Install wpp first" in encode(text, custom_abbrevs={"WORDPRESS Plugin": "wpp"})
+
+
+def test_encode_abbreviations_longest_phrase_any_case():
+    text = "## Rules\n- Review Pull Requests and every REQUEST\n"
+    assert "Review prs+every req" in encode(text)
+
+
+def test_encode_line_forms_keep_priority():
+    text = (
+        "## Rules\n- If cache is stale: purge it\n- Never skip tests\n"
+        "- Always run lint\n- Prefer hooks over core edits\n- 2. Ship it\n"
+    )
+    result = encode(text)
+    for expected in ("?cch is stale->purge", "!!skip tests", "*run lint", "prefer(hooks)>core edits", "#2 Ship"):
+        assert expected in result
+
+
+def test_encode_classifies_sections_by_content():
+    negations = "## Misc\nNever skip tests\nDo not push to main\n\nAvoid globals\n- Use types\n"
+    numbered = "## Misc\n1. Lint\n2. Test\n3. Ship\n"
+    assert "@N:misc" in encode(negations)
+    assert "@P:misc" in encode(numbered)
+
+
+def test_compress_lines_matches_compress_line():
+    lines = ["- If cache is stale: purge it.", "", "Never skip tests;", "as well as\x00 logs", "1. Ship the module"]
+    assert compress_lines(lines) == [compress_line(line) for line in lines]
+    # A copy of the built-in map takes the batched path instead of the cache
+    assert compress_lines(lines, dict(ENCODE_MAP)) == [compress_line(line) for line in lines]
+
+
+def test_compress_line_drops_filler_articles_and_pronouns():
+    assert compress_line("Please review the logs; you should check them and the metrics") == "review logs; chk+metrics"
+    assert compress_line("Keep the  please   docs current") == "Keep docs current"
+
+
+def test_compress_line_default_map_is_cached():
+    line = "- Do NOT skip the configuration check"
+    assert compress_line(line) is compress_line(line, {})
+    assert compress_line(line, {"skip": "SKIP"}) == "!!SKIP configuration check"
+
+
+def test_encode_serves_repeated_lines_from_cache():
+    text = "".join(f"## Step {i}\n- Run the linter on changed files\n" for i in range(5))
+    _encode_body.cache_clear()
+    _compress_line_default.cache_clear()
+    encode(text)
+    info = _compress_line_default.cache_info()
+    assert (info.misses, info.hits) == (1, 4)
+
+
+def test_compress_line_long_whitespace_and_punctuation_runs():
+    line = "keep" + " \t" * 20000 + "+ logs" + "." * 20000
+    assert compress_line(line) == "keep+logs"
+    for encode_map in (None, dict(ENCODE_MAP)):
+        assert compress_lines([line, "logs ;. "], encode_map) == ["keep+logs", "logs"]
+
+
+def test_compress_line_strips_italic_pairs_only():
+    assert compress_line("- Use *strict* mode for __init__ and snake_case names") == (
+        "Use strict mode for init+snake_case names"
+    )
+    assert compress_line("- Keep ***core*** and _private_ helpers") == "Keep core+private helpers"
+
+
+def test_encode_reuses_body_but_not_options():
+    text = "# Doc\n\n## Rules\n- Check the frobnicator\n"
+    first = encode(text)
+    assert encode(text, doc_id="other").split("\n")[2:] == first.split("\n")[2:]
+    assert "M|other|Doc|" in encode(text, doc_id="other")
+    assert "chk frob" in encode(text, custom_abbrevs={"frobnicator": "frob"})
+    assert "frob\n" not in encode(text)
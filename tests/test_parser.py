@@ -1,7 +1,11 @@
 """Tests for the CPF parser."""
 
+import dataclasses
+import pickle
+
 import pytest
 
+from cpf.ast_nodes import Block
 from cpf.parser import ParseError, parse
 
 
@@ -89,3 +93,57 @@ wp::WordPress;dp::Drupal
     constants = doc.get_constants()
     assert constants["wp"] == "WordPress"
     assert constants["dp"] == "Drupal"
+
+
+def test_get_block_lookups(sample_cpf):
+    doc = parse(sample_cpf)
+    assert doc.get_block("coding-standards") is doc.blocks[2]
+    assert doc.get_block("missing") is None
+    assert [b.block_id for b in doc.get_blocks_by_sigil("R")] == [
+        "decision-rules", "coding-standards",
+    ]
+
+    # Lookups follow later changes to the block list
+    doc.blocks.append(Block(sigil="N", block_id="late"))
+    assert doc.get_block("late") is doc.blocks[-1]
+    assert len(doc.get_blocks_by_sigil("N")) == 1
+
+    # ...including same-length replacements and in-place renames
+    first = doc.blocks[0]
+    doc.blocks[0] = Block(sigil="N", block_id="new")
+    assert doc.get_block("new") is doc.blocks[0]
+    assert doc.get_block(first.block_id) is None
+    assert len(doc.get_blocks_by_sigil("N")) == 2
+    doc.blocks[1].block_id = "renamed"
+    assert doc.get_block("renamed") is doc.blocks[1]
+    assert set(dataclasses.asdict(doc)) == {"version", "metadata", "blocks"}
+
+
+def test_parse_constants_split_at_first_separator():
+    text = """CPF|v1
+M|test|Test|test|2026-01-01T00:00:00Z
+---
+
+@C:misc
+ url :: http://x::y ; note
+$root::/srv/app;
+"""
+    doc = parse(text)
+    assert doc.get_constants() == {"url": "http://x::y", "$root": "/srv/app"}
+
+
+def test_parse_crlf_blocks_and_heredoc():
+    text = "CPF|v1\r\nM|d|T|s|t\r\n---\r\n @R:a \r\n\r\n  x  \r\n\r\n@B:b\r\n<<\r\n@R:inside\r\n\r\n>>\r\n@Q:z"
+    with pytest.raises(ParseError, match="Line 13: Unknown sigil 'Q'"):
+        parse(text)
+    doc = parse(text.rsplit("\r\n", 1)[0])
+    assert [(b.block_id, b.lines) for b in doc.blocks] == [("a", ["  x"]), ("b", ["@R:inside", ""])]
+
+
+def test_parse_error_keeps_line_and_message():
+    with pytest.raises(ParseError) as info:
+        parse("CPF|v1\nM|a|b|c|d\n")
+    err = info.value
+    assert (err.line_num, err.message) == (3, "Expected '---' separator")
+    assert str(err) == "Line 3: Expected '---' separator"
+    assert str(pickle.loads(pickle.dumps(err))) == str(err)
@@ -52,3 +52,16 @@ def test_unclosed_heredoc():
 def test_valid_heredoc():
     text = "CPF|v1\nM|t|t|t|t\n---\n\n@B:blob\n<<\nstuff here\n>>\n"
     assert is_valid(text)
+
+
+def test_error_line_numbers_after_heredoc():
+    text = "CPF|v1\nM|d|T|s|t\n---\n@B:b\n<<\n@Q:inside\n>>\n\n@Q:x\n@R:b\n@B:c\n"
+    errors = [(e.line, e.severity) for e in validate(text)]
+    assert errors == [(9, "error"), (10, "warning"), (11, "error")]
+
+
+def test_is_valid_ignores_warnings_and_stops_at_errors():
+    dup = "CPF|v1\nM|t|t|t|t\n---\n@R:a\nx\n@R:a\ny\n"
+    assert [e.severity for e in validate(dup)] == ["warning"]
+    assert is_valid(dup)
+    assert not is_valid(dup + "@Q:bad\n@B:blob\n<<\n")